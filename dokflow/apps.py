@@ -5,7 +5,7 @@ Django app configuration for dokflow.
 import logging
 
 from django.apps import AppConfig
-from django.db.models.signals import pre_delete
+from django.db.models.signals import post_save, pre_delete
 
 from dokflow.settings import LOGGING_LEVEL
 
@@ -26,11 +26,16 @@ class DokflowConfig(AppConfig):
         
         Connects signal handlers for document lifecycle events.
         """
-        from dokflow.signals import protect_documents
+        from dokflow.signals import protect_documents, render_preview
 
         pre_delete.connect(
             protect_documents,
             sender="dokflow.Document",
             dispatch_uid="dokflow_protect_documents",
         )
+        post_save.connect(
+            render_preview,
+            sender="dokflow.Document",
+            dispatch_uid="dokflow_render_preview",
+        )
         logger.info("Dokflow app initialized and signals connected")
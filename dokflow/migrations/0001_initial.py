@@ -63,7 +63,7 @@ class Migration(migrations.Migration):
                         null=True,
                         on_delete=django.db.models.deletion.PROTECT,
                         related_name="replaced_by",
-                        to="doma.document",
+                        to="dokflow.document",
                     ),
                 ),
                 (
@@ -71,7 +71,7 @@ class Migration(migrations.Migration):
                     models.ForeignKey(
                         on_delete=django.db.models.deletion.PROTECT,
                         related_name="documents",
-                        to="doma.documenttype",
+                        to="dokflow.documenttype",
                     ),
                 ),
             ],
@@ -6,7 +6,7 @@ from django.db import migrations, models
 class Migration(migrations.Migration):
 
     dependencies = [
-        ("doma", "0001_initial"),
+        ("dokflow", "0001_initial"),
     ]
 
     operations = [
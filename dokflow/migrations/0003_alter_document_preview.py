@@ -6,7 +6,7 @@ from django.db import migrations, models
 class Migration(migrations.Migration):
 
     dependencies = [
-        ("doma", "0002_alter_document_file"),
+        ("dokflow", "0002_alter_document_file"),
     ]
 
     operations = [
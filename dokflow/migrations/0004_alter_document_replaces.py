@@ -7,7 +7,7 @@ import django.db.models.deletion
 class Migration(migrations.Migration):
 
     dependencies = [
-        ("doma", "0003_alter_document_preview"),
+        ("dokflow", "0003_alter_document_preview"),
     ]
 
     operations = [
@@ -19,7 +19,7 @@ class Migration(migrations.Migration):
                 null=True,
                 on_delete=django.db.models.deletion.PROTECT,
                 related_name="replaced_by",
-                to="doma.document",
+                to="dokflow.document",
             ),
         ),
     ]
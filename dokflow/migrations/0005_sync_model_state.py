@@ -0,0 +1,134 @@
+# Generated by Django 4.2.30 on 2026-10-14 00:53
+
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("dokflow", "0004_alter_document_replaces"),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="document",
+            options={
+                "ordering": ["-created_at"],
+                "verbose_name": "Document",
+                "verbose_name_plural": "Documents",
+            },
+        ),
+        migrations.AlterModelOptions(
+            name="documenttype",
+            options={
+                "ordering": ["name"],
+                "verbose_name": "Document Type",
+                "verbose_name_plural": "Document Types",
+            },
+        ),
+        migrations.AlterField(
+            model_name="document",
+            name="content",
+            field=models.TextField(
+                blank=True,
+                help_text="Optional extracted text content from document",
+                null=True,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="document",
+            name="created_at",
+            field=models.DateTimeField(
+                auto_now_add=True, help_text="Set on creation, never changes"
+            ),
+        ),
+        migrations.AlterField(
+            model_name="document",
+            name="file",
+            field=models.FileField(
+                blank=True, help_text="Original document file", upload_to="documents/"
+            ),
+        ),
+        migrations.AlterField(
+            model_name="document",
+            name="name",
+            field=models.CharField(help_text="Document display name", max_length=255),
+        ),
+        migrations.AlterField(
+            model_name="document",
+            name="preview",
+            field=models.ImageField(
+                blank=True,
+                help_text="Auto-generated preview image for PDF documents",
+                null=True,
+                upload_to="preview/",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="document",
+            name="replaces",
+            field=models.OneToOneField(
+                blank=True,
+                help_text="Reference to the previous version of this document",
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="replaced_by",
+                to="dokflow.document",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="document",
+            name="type",
+            field=models.ForeignKey(
+                help_text="Document classification type",
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="documents",
+                to="dokflow.documenttype",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="document",
+            name="updated_at",
+            field=models.DateTimeField(
+                auto_now=True, help_text="Automatically updated on each save"
+            ),
+        ),
+        migrations.AlterField(
+            model_name="document",
+            name="uuid",
+            field=models.UUIDField(
+                default=uuid.uuid4,
+                editable=False,
+                help_text="Immutable unique identifier",
+                unique=True,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="documenttype",
+            name="name",
+            field=models.CharField(
+                help_text="Human-readable document type (e.g., 'Invoice', 'Contract')",
+                max_length=255,
+                unique=True,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="documenttype",
+            name="slug",
+            field=models.SlugField(
+                editable=False,
+                help_text="Auto-generated URL-friendly identifier",
+                unique=True,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="document",
+            index=models.Index(fields=["uuid"], name="dokflow_doc_uuid_cf89fc_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="document",
+            index=models.Index(fields=["type"], name="dokflow_doc_type_id_619d6f_idx"),
+        ),
+    ]
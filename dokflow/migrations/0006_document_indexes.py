@@ -0,0 +1,19 @@
+# Generated by Django 4.2.30 on 2026-10-14 00:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("dokflow", "0005_sync_model_state"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="document",
+            index=models.Index(
+                fields=["-created_at", "type"], name="doc_created_type_idx"
+            ),
+        ),
+    ]
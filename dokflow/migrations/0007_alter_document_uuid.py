@@ -0,0 +1,24 @@
+# Generated by Django 4.2.30 on 2026-10-14 01:00
+
+from django.db import migrations, models
+import dokflow.utils
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("dokflow", "0006_document_indexes"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="document",
+            name="uuid",
+            field=models.UUIDField(
+                default=dokflow.utils.uuid7,
+                editable=False,
+                help_text="Immutable unique identifier",
+                unique=True,
+            ),
+        ),
+    ]
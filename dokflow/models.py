@@ -11,21 +11,36 @@ and management in Django applications. It implements:
 """
 
 import logging
+from functools import lru_cache
 from io import BytesIO
 from uuid import uuid4
 
 from django.core.exceptions import ValidationError
-from django.core.files.uploadedfile import SimpleUploadedFile
-from django.db import models, transaction
+from django.core.files import File
+from django.db import IntegrityError, connections, models, transaction
+from django.db.models import Exists, OuterRef, ProtectedError
+from django.utils import timezone
 from django.utils.text import slugify
 from django.utils.translation import gettext as _
 
-from dokflow.settings import DOCUMENTS_DIR, PREVIEW_DIR, RENDER_PREVIEW
-from dokflow.utils import generate_pdf_preview
+from dokflow.settings import DOCUMENTS_DIR, PREVIEW_DIR, PROTECT_AFTER, RENDER_PREVIEW
+from dokflow.tasks import enqueue_preview
+from dokflow.utils import generate_pdf_preview, uuid7
 
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=4096)
+def _cached_slugify(name, allow_unicode=False):
+    """
+    Memoized slugify(), which is a pure function of its input.
+
+    Bulk imports repeat the same few names, which skips the unicode
+    normalization and regex substitutions for all but the first of them.
+    """
+    return slugify(name, allow_unicode=allow_unicode)
+
+
 class CreatedModifiedModel(models.Model):
     """
     Abstract base model that tracks creation and modification timestamps.
@@ -63,9 +78,19 @@ class SlugifiedModel(models.Model):
         abstract = True
 
     def save(self, *args, **kwargs):
-        """Generate slug from name field if this is a new instance."""
+        """
+        Generate slug from name field if this is a new instance.
+
+        Different names can slugify to the same value (e.g. 'Invoice' and
+        'invoice!'), or only differ after the slug's max_length, in which case
+        a short random suffix keeps the slug unique.
+        """
         if self._state.adding:
-            self.slug = slugify(self.name)
+            max_length = self._meta.get_field("slug").max_length
+            slug = _cached_slugify(self.name)[:max_length]
+            if type(self)._default_manager.filter(slug=slug).exists():
+                slug = f"{slug[:max_length - 9]}-{uuid4().hex[:8]}"
+            self.slug = slug
         super().save(*args, **kwargs)
 
 
@@ -92,11 +117,80 @@ class DocumentType(SlugifiedModel):
         return self.name
 
 
+class DocumentQuerySet(models.QuerySet):
+    """
+    Custom queryset for Document model with bulk protection and annotations.
+    """
+
+    def with_latest_flag(self):
+        """
+        Annotate documents with whether they are the latest version.
+
+        The flag is computed with an EXISTS subquery, so iterating the result
+        and reading Document.is_latest_version does not issue a query per row.
+
+        Returns:
+            QuerySet: Documents annotated with '_is_latest'
+        """
+        return self.annotate(
+            _is_latest=~Exists(
+                self.model.objects.filter(replaces_id=OuterRef("pk"))
+            )
+        )
+
+    def with_content(self):
+        """
+        Load the 'content' column, which the manager defers by default.
+
+        Note that this clears any other deferred fields of the queryset.
+
+        Returns:
+            QuerySet: Documents including their content
+        """
+        return self.defer(None)
+
+    def delete(self):
+        """
+        Delete the documents unless any of them is protected.
+
+        Checks the protection period for the whole queryset with a single
+        query before deleting, instead of failing in the pre_delete signal
+        on the first protected document.
+
+        Raises:
+            ProtectedError: If any document is protected from deletion
+        """
+        protected = self.filter(created_at__lt=timezone.now() - PROTECT_AFTER)
+        if protected.exists():
+            logger.warning("Attempted bulk deletion of protected documents")
+            raise ProtectedError(
+                _("Some of these documents are protected from deletion for audit "
+                  "compliance. Create a new version using "
+                  "Document.objects.replace() if updates are needed."),
+                protected,
+            )
+        return super().delete()
+
+    delete.alters_data = True
+    delete.queryset_only = True
+
+
 class DocumentManager(models.Manager):
     """
     Custom manager for Document model with specialized query and creation methods.
+
+    The potentially large 'content' column is deferred by default, use
+    with_content() to load it together with the documents.
+
+    This is the default manager, so the deferral also applies to related
+    managers, the admin, serializers and dumpdata. Reading 'content' on each
+    of many documents loaded without with_content() costs one query per
+    document.
     """
 
+    def get_queryset(self):
+        return super().get_queryset().defer("content")
+
     def replace(self, document, file):
         """
         Create a new version of a document while preserving the original.
@@ -106,7 +200,7 @@ class DocumentManager(models.Manager):
         and compliance requirements are met.
         
         Args:
-            document: The Document instance to be replaced
+            document: The Document instance (or its primary key) to be replaced
             file: The SimpleUploadedFile or file-like object for the new version
             
         Returns:
@@ -115,27 +209,184 @@ class DocumentManager(models.Manager):
         Raises:
             ValidationError: If document is already the latest version or invalid
         """
+        if not isinstance(document, self.model):
+            document = self.select_related("type").with_content().get(pk=document)
+
         if not document.pk:
             raise ValidationError(_("Cannot replace an unsaved document."))
         
+        new_document = self._build_replacement(document, file)
         try:
-            with transaction.atomic():
-                new_document = self.create(
-                    name=document.name,
-                    type=document.type,
-                    preview=document.preview,
-                    content=document.content,
-                    replaces=document,
-                    file=file,
-                )
-                logger.info(
-                    f"Document {document.pk} replaced with version {new_document.pk}"
-                )
-                return new_document
+            try:
+                with transaction.atomic(using=self.db):
+                    new_document.save(
+                        skip_validation=True, force_insert=True, using=self.db
+                    )
+            except IntegrityError:
+                # FileField.pre_save() has stored the file before the INSERT
+                # failed, don't leave it behind without a document.
+                new_document.file.delete(save=False)
+                if self.filter(replaces=document).exists():
+                    raise ValidationError(
+                        _("This document has already been replaced by a newer version.")
+                    )
+                raise
+            logger.info(
+                f"Document {document.pk} replaced with version {new_document.pk}"
+            )
+            return new_document
         except Exception as e:
             logger.error(f"Failed to replace document {document.pk}: {str(e)}")
             raise
 
+    def bulk_import(self, rows, batch_size=500):
+        """
+        Create many documents with batched INSERTs.
+
+        Unlike create(), this bypasses Document.save() and its validation, so
+        rows must come from a trusted source (e.g. a backfill). Previews are
+        scheduled for all created documents once the transaction commits.
+
+        On backends where bulk_create() does not return primary keys (e.g.
+        MySQL) they are looked up by the client-generated 'uuid' afterwards,
+        so the returned documents always have their pk set.
+
+        Args:
+            rows: Iterable of dicts with Document field values
+                (e.g. name, type and file)
+            batch_size: Number of documents per INSERT statement
+
+        Returns:
+            list: The created Document instances
+        """
+        documents = [self.model(**row) for row in rows]
+        with transaction.atomic(using=self.db):
+            created = self.bulk_create(documents, batch_size=batch_size)
+
+            missing = {
+                document.uuid: document for document in created if not document.pk
+            }
+            uuids = list(missing)
+            for start in range(0, len(uuids), batch_size):
+                pks = self.filter(uuid__in=uuids[start:start + batch_size])
+                for uuid, pk in pks.values_list("uuid", "pk"):
+                    missing[uuid].pk = pk
+
+            if RENDER_PREVIEW:
+                for document in created:
+                    if document.file and not document.preview:
+                        enqueue_preview(document.pk, using=self.db)
+        logger.info(f"Imported {len(created)} documents")
+        return created
+
+    def _build_replacement(self, document, file):
+        """
+        Build the unsaved new version of a document.
+
+        All values but the file are copied from an already stored document, so
+        replace() saves it without full_clean(): revalidating them (including
+        the uniqueness SELECTs for 'uuid' and 'replaces') is wasted work. A
+        document that has already been replaced is rejected by the unique
+        constraint on 'replaces'. The type is copied by id, so only a deferred
+        'content' is read from the database.
+        """
+        return self.model(
+            name=document.name,
+            type_id=document.type_id,
+            preview=document.preview,
+            content=document.content,
+            replaces=document,
+            file=file,
+        )
+
+    def version_chain_for(self, pk):
+        """
+        Load the complete version chain of a document in a single query.
+
+        Args:
+            pk: Primary key of the newest document of the chain
+
+        Returns:
+            list: Documents from original to the given version
+        """
+        pk = self.model._meta.pk.to_python(pk)
+        return self.version_chains_for([pk]).get(pk, [])
+
+    def version_chains_for(self, pks):
+        """
+        Load the version chains of several documents in a single query.
+
+        If more documents are requested than the database accepts in one
+        query, they are loaded in batches with one query each.
+
+        Walks the 'replaces' relation inside the database using a recursive
+        CTE instead of following it one SELECT per version. The documents are
+        annotated like with_latest_flag(), so is_latest_version needs no
+        further queries.
+
+        Args:
+            pks: Primary keys of the newest documents of the chains
+
+        Returns:
+            dict: Lists of documents from original to the given version,
+                keyed by the given primary keys
+        """
+        pks = list(dict.fromkeys(self.model._meta.pk.to_python(pk) for pk in pks))
+        if not pks:
+            return {}
+
+        connection = connections[self.db]
+        quote_name = connection.ops.quote_name
+        table = quote_name(self.model._meta.db_table)
+        pk = quote_name(self.model._meta.pk.column)
+        replaces = quote_name(self.model._meta.get_field("replaces").column)
+        # Leave out 'content' like get_queryset() does, it is loaded on access
+        columns = ", ".join(
+            quote_name(field.column)
+            for field in self.model._meta.concrete_fields
+            if field.name != "content"
+        )
+
+        # Stay below the backend's limits for query parameters (e.g. 999 on
+        # older SQLite builds) and IN list sizes (1000 on Oracle)
+        limits = [
+            limit
+            for limit in (
+                connection.features.max_query_params,
+                connection.ops.max_in_list_size(),
+            )
+            if limit
+        ]
+        batch_size = min(limits) if limits else len(pks)
+
+        chains = {}
+        for start in range(0, len(pks), batch_size):
+            batch = pks[start:start + batch_size]
+            placeholders = ", ".join(["%s"] * len(batch))
+            query = (
+                f"WITH RECURSIVE chain AS ("
+                f"SELECT d.*, d.{pk} AS chain_root, 0 AS depth FROM {table} d "
+                f"WHERE d.{pk} IN ({placeholders}) "
+                f"UNION ALL "
+                f"SELECT d.*, c.chain_root, c.depth + 1 FROM {table} d "
+                f"JOIN chain c ON d.{pk} = c.{replaces}"
+                f") SELECT {columns}, chain_root, NOT EXISTS ("
+                f"SELECT 1 FROM {table} r WHERE r.{replaces} = chain.{pk}"
+                f") AS is_latest FROM chain ORDER BY chain_root, depth DESC"
+            )
+            for document in self.raw(query, batch).prefetch_related("type"):
+                chains.setdefault(document.chain_root, []).append(document)
+                document._is_latest = bool(document.is_latest)
+                del document.chain_root, document.is_latest
+
+        # Link the versions with each other so that walking 'replaces'
+        # (or 'replaced_by') on the result does not hit the database again.
+        for chain in chains.values():
+            for older, newer in zip(chain, chain[1:]):
+                newer.replaces = older
+
+        return chains
+
 
 class Document(CreatedModifiedModel):
     """
@@ -164,7 +415,7 @@ class Document(CreatedModifiedModel):
     )
     uuid = models.UUIDField(
         unique=True,
-        default=uuid4,
+        default=uuid7,
         editable=False,
         help_text="Immutable unique identifier"
     )
@@ -193,14 +444,15 @@ class Document(CreatedModifiedModel):
         help_text="Original document file"
     )
 
-    objects = DocumentManager()
+    objects = DocumentManager.from_queryset(DocumentQuerySet)()
 
     class Meta:
         ordering = ["-created_at"]
         verbose_name = "Document"
         verbose_name_plural = "Documents"
         indexes = [
-            models.Index(fields=["-created_at"]),
+            # Covers the default ordering alone and combined with type filters
+            models.Index(fields=["-created_at", "type"], name="doc_created_type_idx"),
             models.Index(fields=["uuid"]),
             models.Index(fields=["type"]),
         ]
@@ -208,6 +460,14 @@ class Document(CreatedModifiedModel):
     def __str__(self):
         return f"{self.pk} - {self.name}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Remember the stored file name to check immutability without a query."""
+        instance = super().from_db(db, field_names, values)
+        if "file" in field_names:
+            instance._loaded_file = instance.file.name
+        return instance
+
     def clean(self):
         """
         Validate document before saving.
@@ -217,69 +477,131 @@ class Document(CreatedModifiedModel):
         """
         if self.pk:
             # Check if this is an existing document (not a new one)
-            original = Document.objects.get(pk=self.pk)
-            if original.file and self.file != original.file:
+            if hasattr(self, "_loaded_file"):
+                original_file = self._loaded_file
+            else:
+                original_file = (
+                    Document.objects.only("file").get(pk=self.pk).file.name
+                )
+            if original_file and self.file.name != original_file:
                 raise ValidationError(
                     _("Documents are immutable and cannot be modified. "
                       "Use Document.objects.replace() to create a new version.")
                 )
 
-    def save(self, *args, **kwargs):
+    def save(self, *args, skip_validation=False, update_fields=None, **kwargs):
         """
-        Save document with automatic preview generation.
+        Save document after validating it.
         
         Handles:
         - Validation of immutability constraints
-        - Automatic PDF preview generation (if RENDER_PREVIEW is enabled)
-        - Error handling and logging
+
+        The PDF preview (if RENDER_PREVIEW is enabled) is generated in the
+        background once the document has been created, see dokflow.tasks.
+
+        Without update_fields every loaded column is rewritten. Documents from
+        the default manager have 'content' deferred, so it is neither validated
+        nor written unless it has been accessed (or with_content() was used).
+        Callers changing only some fields of an existing document should pass
+        them as update_fields; only those fields are validated and written
+        then. Note that 'updated_at' is only bumped if it is part of
+        update_fields.
+
+        Args:
+            skip_validation: Skip full_clean(). Only meant for internal callers
+                that build the document from already validated data, such as
+                DocumentManager.replace().
+            update_fields: Names of the fields to validate and write, also
+                accepted as the fourth positional argument like Model.save()
         
         Raises:
             ValidationError: If document violates business rules
         """
-        self.full_clean()
-        
-        # Generate preview for new documents with PDF files
-        if not self.preview and RENDER_PREVIEW and self.file:
-            try:
-                self._generate_preview()
-            except Exception as e:
-                logger.warning(
-                    f"Preview generation failed for document {self.name}: {str(e)}"
+        if len(args) > 3:
+            # Model.save(force_insert, force_update, using, update_fields)
+            if update_fields is not None:
+                raise TypeError(
+                    "save() got multiple values for argument 'update_fields'"
+                )
+            args, update_fields = args[:3], args[3]
+
+        if update_fields is not None:
+            # Accept attnames like 'type_id'; unknown names are passed through
+            # for Model.save() to reject with its usual ValueError.
+            field_names = {}
+            for field in self._meta.concrete_fields:
+                field_names[field.name] = field_names[field.attname] = field.name
+            update_fields = {field_names.get(name, name) for name in update_fields}
+
+        if not skip_validation:
+            # Validating a deferred field would load it (e.g. 'content'), and
+            # a loaded field is written by the UPDATE again.
+            exclude = set(self.get_deferred_fields())
+            if update_fields is not None:
+                exclude.update(
+                    field.name
+                    for field in self._meta.concrete_fields
+                    if field.name not in update_fields
                 )
-                # Continue saving even if preview generation fails
+            self.full_clean(exclude=exclude)
 
-        super().save(*args, **kwargs)
+        super().save(*args, update_fields=update_fields, **kwargs)
+        if update_fields is None or "file" in update_fields:
+            self._loaded_file = self.file.name
 
     def _generate_preview(self):
         """
-        Generate a JPEG preview from PDF file.
+        Generate and store a JPEG preview from PDF file.
         
         Attempts to convert the first page of a PDF to a JPEG image.
         If conversion fails, logs warning and continues without preview.
+
+        The preview is written with a single UPDATE of the 'preview' column,
+        bypassing save() and its validation. The stored file is read in a
+        single pass (or not at all if the preview is cached) and closed
+        afterwards, so remote storage sees one GET per document.
         """
         try:
             preview_image = generate_pdf_preview(self.file)
             if preview_image:
-                self.preview = SimpleUploadedFile(
-                    "preview.jpg",
-                    preview_image.getvalue(),
-                    content_type="image/jpeg"
+                self.preview.save("preview.jpg", File(preview_image), save=False)
+                Document.objects.filter(pk=self.pk).update(
+                    preview=self.preview.name
                 )
                 logger.debug(f"Preview generated for document {self.name}")
         except Exception as e:
             logger.warning(
                 f"Could not generate preview for {self.name}: {str(e)}"
             )
+        finally:
+            self.file.close()
 
     @property
     def is_latest_version(self):
         """
         Check if this is the latest version of the document.
         
+        Never touch the 'replaced_by' reverse relation just to get this flag:
+        without select_related() each access fetches the full row, with it
+        every query grows by a LEFT OUTER JOIN. Instead, load documents through
+        Document.objects.with_latest_flag() (or version_chain), which computes
+        the flag with an EXISTS subquery on the 'replaces' index.
+
+        An already cached 'replaced_by' relation (e.g. set by replace()) takes
+        precedence over the annotation. Unannotated documents fall back to a
+        single EXISTS query per call.
+
         Returns:
             bool: True if no newer version replaces this document
         """
-        return not hasattr(self, 'replaced_by') or self.replaced_by is None
+        replaced_by = Document.replaced_by.related
+        if replaced_by.is_cached(self):
+            return replaced_by.get_cached_value(self) is None
+        if hasattr(self, "_is_latest"):
+            return self._is_latest
+        if not self.pk:
+            return True
+        return not Document.objects.filter(replaces_id=self.pk).exists()
 
     @property
     def version_chain(self):
@@ -289,11 +611,14 @@ class Document(CreatedModifiedModel):
         Returns:
             list: Documents from original to current version
         """
-        chain = [self]
-        current = self
-        
-        while hasattr(current, 'replaces') and current.replaces:
-            chain.insert(0, current.replaces)
-            current = current.replaces
-        
+        if not self.pk:
+            return [self]
+
+        chain = Document.objects.version_chain_for(self.pk)
+        if not chain:
+            return [self]
+        if len(chain) > 1:
+            self.replaces = chain[-2]
+        self._is_latest = chain[-1]._is_latest
+        chain[-1] = self
         return chain
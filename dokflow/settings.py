@@ -10,40 +10,27 @@ from django.conf import settings
 
 
 # Document storage configuration
-DOCUMENTS_DIR = getattr(
-    settings,
-    "DOKFLOW_DOCUMENTS_DIR",
-    "documents/",
-    help_text="Directory for storing documents within MEDIA_ROOT"
-)
-
-PREVIEW_DIR = getattr(
-    settings,
-    "DOKFLOW_PREVIEW_DIR",
-    "preview/",
-    help_text="Directory for storing preview images within MEDIA_ROOT"
-)
+# Directory for storing documents within MEDIA_ROOT
+DOCUMENTS_DIR = getattr(settings, "DOKFLOW_DOCUMENTS_DIR", "documents/")
+
+# Directory for storing preview images within MEDIA_ROOT
+PREVIEW_DIR = getattr(settings, "DOKFLOW_PREVIEW_DIR", "preview/")
 
 # Document protection configuration
-PROTECT_AFTER = getattr(
-    settings,
-    "DOKFLOW_PROTECT_AFTER",
-    timedelta(days=1),
-    help_text="Duration after which documents become protected from deletion"
-)
+# Duration after which documents become protected from deletion
+PROTECT_AFTER = getattr(settings, "DOKFLOW_PROTECT_AFTER", timedelta(days=1))
+PROTECT_AFTER_SECONDS = PROTECT_AFTER.total_seconds()
 
 # Preview generation configuration
-RENDER_PREVIEW = getattr(
-    settings,
-    "DOKFLOW_RENDER_PREVIEW",
-    True,
-    help_text="Enable automatic preview generation for PDF documents"
-)
+# Enable automatic preview generation for PDF documents
+RENDER_PREVIEW = getattr(settings, "DOKFLOW_RENDER_PREVIEW", True)
+
+# Where previews are rendered: "sync" (in-process after commit) or "celery"
+PREVIEW_TASK_BACKEND = getattr(settings, "DOKFLOW_PREVIEW_TASK_BACKEND", "sync")
+
+# Seconds rendered previews are kept in the Django cache, keyed by file hash
+PREVIEW_CACHE_TIMEOUT = getattr(settings, "DOKFLOW_PREVIEW_CACHE_TIMEOUT", 86400)
 
 # Logging configuration
-LOGGING_LEVEL = getattr(
-    settings,
-    "DOKFLOW_LOGGING_LEVEL",
-    "INFO",
-    help_text="Log level for dokflow logger (DEBUG, INFO, WARNING, ERROR)"
-)
+# Log level for dokflow logger (DEBUG, INFO, WARNING, ERROR)
+LOGGING_LEVEL = getattr(settings, "DOKFLOW_LOGGING_LEVEL", "INFO")
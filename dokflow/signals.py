@@ -1,7 +1,7 @@
 """
 Signal handlers for dokflow document lifecycle events.
 
-Handles document protection and audit compliance.
+Handles document protection, audit compliance and preview generation.
 """
 
 import logging
@@ -10,7 +10,8 @@ from django.db.models import ProtectedError
 from django.utils import timezone
 from django.utils.translation import gettext as _
 
-from dokflow.settings import PROTECT_AFTER
+from dokflow.settings import PROTECT_AFTER_SECONDS, RENDER_PREVIEW
+from dokflow.tasks import enqueue_preview
 
 logger = logging.getLogger(__name__)
 
@@ -31,9 +32,9 @@ def protect_documents(sender, instance, **kwargs):
     Raises:
         ProtectedError: If document is protected from deletion
     """
-    time_since_creation = timezone.now() - instance.created_at
-    
-    if time_since_creation > PROTECT_AFTER:
+    seconds_since_creation = (timezone.now() - instance.created_at).total_seconds()
+
+    if seconds_since_creation > PROTECT_AFTER_SECONDS:
         logger.warning(
             f"Attempted deletion of protected document {instance.pk} "
             f"(created: {instance.created_at})"
@@ -43,3 +44,24 @@ def protect_documents(sender, instance, **kwargs):
             _("This document is protected from deletion for audit compliance. "
               "Create a new version using Document.objects.replace() if updates are needed.")
         )
+
+
+def render_preview(sender, instance, created, raw=False, using=None, **kwargs):
+    """
+    Schedule preview generation for newly created documents.
+
+    The preview is rendered by dokflow.tasks.generate_preview_task after the
+    transaction commits, keeping PDF rasterization out of the request.
+
+    Args:
+        sender: The Document model class
+        instance: The Document instance that has been saved
+        created: True if a new document has been created
+        raw: True if the document is loaded from a fixture
+        using: Database alias the document has been saved to
+        **kwargs: Additional signal arguments
+    """
+    if not created or raw or not RENDER_PREVIEW:
+        return
+    if instance.file and not instance.preview:
+        enqueue_preview(instance.pk, using=using)
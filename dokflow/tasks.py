@@ -0,0 +1,95 @@
+"""
+Background tasks for dokflow documents.
+
+Where previews are rendered is selected with DOKFLOW_PREVIEW_TASK_BACKEND:
+
+- ``"sync"`` (default): in-process, once the transaction creating the document
+  has been committed.
+- ``"celery"``: as the ``dokflow.generate_preview`` Celery task in a worker
+  (``pip install django-dokflow[celery]``), so saving a document never waits
+  for preview rendering.
+"""
+
+import logging
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
+
+from dokflow.settings import PREVIEW_TASK_BACKEND
+from dokflow.utils import warm_up
+
+PREVIEW_TASK_BACKENDS = ("sync", "celery")
+
+if PREVIEW_TASK_BACKEND not in PREVIEW_TASK_BACKENDS:
+    raise ImproperlyConfigured(
+        f"DOKFLOW_PREVIEW_TASK_BACKEND must be one of {PREVIEW_TASK_BACKENDS}, "
+        f"not {PREVIEW_TASK_BACKEND!r}"
+    )
+
+logger = logging.getLogger(__name__)
+
+
+def generate_preview_task(pk):
+    """
+    Generate the preview image for a stored document.
+
+    Args:
+        pk: Primary key of the Document
+    """
+    from dokflow.models import Document
+
+    document = (
+        Document.objects.only("pk", "name", "file", "preview").filter(pk=pk).first()
+    )
+    if document is None:
+        logger.warning(f"Document {pk} vanished before its preview was generated")
+        return
+    if document.preview or not document.file:
+        return
+    document._generate_preview()
+
+
+def warm_up_worker(**kwargs):
+    """Initialize PyMuPDF once per worker process instead of in the first task."""
+    warm_up()
+
+
+if PREVIEW_TASK_BACKEND == "celery":
+    try:
+        from celery import shared_task
+        from celery.signals import worker_process_init
+    except ImportError as e:
+        raise ImproperlyConfigured(
+            "DOKFLOW_PREVIEW_TASK_BACKEND = 'celery' requires Celery, "
+            "install django-dokflow[celery]"
+        ) from e
+
+    generate_preview_task = shared_task(name="dokflow.generate_preview")(
+        generate_preview_task
+    )
+    worker_process_init.connect(
+        warm_up_worker, weak=False, dispatch_uid="dokflow_warm_up_worker"
+    )
+
+
+def _send_preview_task(pk):
+    """Hand the preview task to Celery, logging instead of raising on failure."""
+    try:
+        generate_preview_task.delay(pk)
+    except Exception as e:
+        # The document is already committed, a missing preview is not fatal
+        logger.error(f"Could not schedule preview for document {pk}: {str(e)}")
+
+
+def enqueue_preview(pk, using=None):
+    """
+    Schedule preview generation for a document once the transaction commits.
+
+    Args:
+        pk: Primary key of the Document
+        using: Database alias of the transaction
+    """
+    if PREVIEW_TASK_BACKEND == "celery":
+        transaction.on_commit(lambda: _send_preview_task(pk), using=using)
+    else:
+        transaction.on_commit(lambda: generate_preview_task(pk), using=using)
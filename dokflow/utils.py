@@ -2,56 +2,199 @@
 Utility functions for dokflow document processing.
 """
 
+import hashlib
 import logging
+import os
+import tempfile
+import time
+from contextlib import ExitStack
 from io import BytesIO
+from uuid import UUID
 
-from pdf2image import convert_from_bytes
+import pymupdf
+from django.core.cache import cache
+
+from dokflow.settings import PREVIEW_CACHE_TIMEOUT
 
 logger = logging.getLogger(__name__)
 
+# Width in pixels of generated preview images, height keeps the aspect ratio
+PREVIEW_WIDTH = 800
+PREVIEW_QUALITY = 85
+
+
+def uuid7():
+    """
+    Generate a time-ordered UUID version 7 (RFC 9562).
+
+    The 48 most significant bits hold the Unix time in milliseconds, the rest
+    is random. New values therefore land at the right end of a btree index
+    instead of at random pages like uuid4().
+
+    Returns:
+        UUID: A new version 7 UUID
+    """
+    timestamp_ms = time.time_ns() // 1_000_000
+    value = (timestamp_ms & 0xFFFF_FFFF_FFFF) << 80
+    value |= int.from_bytes(os.urandom(10), "big")
+    # Set version (4 bits after the timestamp) and RFC 4122 variant
+    value = (value & ~(0xF << 76)) | (0x7 << 76)
+    value = (value & ~(0x3 << 62)) | (0x2 << 62)
+    return UUID(int=value)
+
+
+def warm_up():
+    """
+    Render a tiny PDF once to initialize PyMuPDF.
+
+    The first rendering in a process pays for loading fonts and setting up
+    MuPDF's caches. Calling this when a worker process starts moves that cost
+    out of the first preview task.
+    """
+    with pymupdf.open() as document:
+        page = document.new_page(width=72, height=72)
+        page.insert_text((8, 36), "dokflow")
+        page.get_pixmap().tobytes("jpeg", jpg_quality=PREVIEW_QUALITY)
+    logger.debug("PyMuPDF warmed up")
+
+
+def _local_path(file_field):
+    """
+    Return a filesystem path the PDF can be read from directly.
+
+    Args:
+        file_field: Django FieldFile, UploadedFile or file-like object
+
+    Returns:
+        str: Path of the file, or None if it is only available as a stream
+    """
+    if getattr(file_field, "_committed", False):
+        try:
+            return file_field.path
+        except (AttributeError, NotImplementedError, ValueError):
+            # Storage without local filesystem access (e.g. S3)
+            return None
+
+    # Large uploads are spooled to disk by Django's TemporaryFileUploadHandler,
+    # either passed directly or wrapped in a not yet committed FieldFile
+    for uploaded_file in (file_field, getattr(file_field, "file", None)):
+        if hasattr(uploaded_file, "temporary_file_path"):
+            return uploaded_file.temporary_file_path()
+    return None
+
+
+def _sha256_path(path, chunk_size=1 << 20):
+    """Return the hex SHA-256 digest of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as infile:
+        for chunk in iter(lambda: infile.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _spool_to_disk(file_field, directory, chunk_size=1 << 20):
+    """
+    Copy a file-like object to disk in chunks, hashing it on the way.
+
+    Args:
+        file_field: Django File or file-like object containing PDF data
+        directory: Directory to write the copy to
+        chunk_size: Number of bytes read at once
+
+    Returns:
+        tuple: Path of the copy and its hex SHA-256 digest
+    """
+    digest = hashlib.sha256()
+    path = os.path.join(directory, "document.pdf")
+    if hasattr(file_field, "chunks"):
+        chunks = file_field.chunks(chunk_size=chunk_size)
+    else:
+        chunks = iter(lambda: file_field.read(chunk_size), b"")
+    with open(path, "wb") as outfile:
+        for chunk in chunks:
+            digest.update(chunk)
+            outfile.write(chunk)
+    # Reset file pointer if seekable
+    if hasattr(file_field, "seek"):
+        file_field.seek(0)
+    return path, digest.hexdigest()
+
 
 def generate_pdf_preview(file_field, max_pages: int = 1):
     """
     Generate a preview image from a PDF file.
-    
+
     Converts the first page of a PDF document to a JPEG image for preview purposes.
-    
+    Rendering happens in-process with PyMuPDF. Files available on the local
+    filesystem are opened by path, other files are first copied to a temporary
+    file in chunks, so memory use does not grow with the size of the PDF.
+    Rendered previews are cached by the SHA-256 of the PDF, so identical files
+    are only rasterized once.
+
     Args:
         file_field: Django FileField or file-like object containing PDF data
-        max_pages: Maximum number of pages to process (default: 1)
-        
+        max_pages: Ignored, the preview always shows the first page only
+
     Returns:
         BytesIO: JPEG image buffer, or None if conversion fails
-        
+
     Raises:
         IOError: If file cannot be read
-        Exception: If pdf2image conversion fails
+        Exception: If PyMuPDF cannot open or render the PDF
     """
     try:
-        # Read file content
-        if hasattr(file_field, 'read'):
-            file_content = file_field.read()
-            # Reset file pointer if seekable
-            if hasattr(file_field, 'seek'):
-                file_field.seek(0)
-        else:
-            file_content = file_field
-
-        # Convert PDF to image
-        images = convert_from_bytes(file_content, first_page=1, last_page=max_pages)
-        
-        if not images:
-            logger.warning("PDF conversion returned no images")
-            return None
-        
-        # Save first image to BytesIO buffer
-        preview_buffer = BytesIO()
-        images[0].save(preview_buffer, format='JPEG', quality=85)
-        preview_buffer.seek(0)
-        
-        logger.debug(f"Successfully generated preview from PDF ({len(images)} pages)")
+        with ExitStack() as stack:
+            path = _local_path(file_field)
+            file_content = None
+            if path:
+                digest = _sha256_path(path)
+            elif hasattr(file_field, "read"):
+                # Bound memory use for remote storage and in-memory uploads
+                spool_directory = stack.enter_context(
+                    tempfile.TemporaryDirectory(prefix="dokflow")
+                )
+                path, digest = _spool_to_disk(file_field, spool_directory)
+            else:
+                file_content = file_field
+                digest = hashlib.sha256(file_content).hexdigest()
+
+            # Identical uploads are common, hashing is far cheaper than rendering
+            cache_key = f"dokflow:preview:{digest}"
+            try:
+                cached_preview = cache.get(cache_key)
+            except Exception as e:
+                # The cache is only an optimization, render without it
+                logger.warning(f"Could not read cached preview: {str(e)}")
+                cached_preview = None
+            if cached_preview is not None:
+                logger.debug(f"Using cached preview for PDF {digest}")
+                return BytesIO(cached_preview)
+
+            if path:
+                document = pymupdf.open(path, filetype="pdf")
+            else:
+                document = pymupdf.open(stream=file_content, filetype="pdf")
+
+            with document:
+                if not document.page_count:
+                    logger.warning("PDF document has no pages")
+                    return None
+
+                # Render in-process straight to JPEG, scaled to PREVIEW_WIDTH
+                page = document.load_page(0)
+                zoom = PREVIEW_WIDTH / page.rect.width
+                pixmap = page.get_pixmap(matrix=pymupdf.Matrix(zoom, zoom))
+                preview_buffer = BytesIO(
+                    pixmap.tobytes("jpeg", jpg_quality=PREVIEW_QUALITY)
+                )
+
+        try:
+            cache.set(cache_key, preview_buffer.getvalue(), PREVIEW_CACHE_TIMEOUT)
+        except Exception as e:
+            logger.warning(f"Could not cache preview: {str(e)}")
+        logger.debug("Successfully generated preview from PDF")
         return preview_buffer
-        
+
     except Exception as e:
         logger.error(f"PDF preview generation failed: {str(e)}")
         raise
@@ -1,9 +1,16 @@
+from io import BytesIO
+from unittest.mock import patch
+
 from django.core.exceptions import ValidationError
+from django.core.files.storage import FileSystemStorage, default_storage
+from django.db import connection
 from django.db.models import ProtectedError
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from freezegun import freeze_time
 
-from dokflow.models import Document
+from dokflow.models import Document, DocumentType
+from dokflow.settings import DOCUMENTS_DIR
 from tests.factories import (
     DocumentFactory,
     DocumentTypeFactory,
@@ -16,17 +23,79 @@ class DokflowTestCase(TestCase):
     def setUp(self):
         self.t = DocumentTypeFactory()
 
+    def test_document_type_slug_collision(self):
+        t1 = DocumentType.objects.create(name="Invoice")
+        t2 = DocumentType.objects.create(name="Invoice!")
+        self.assertEqual(t1.slug, "invoice")
+        self.assertTrue(t2.slug.startswith("invoice-"))
+
+    def test_document_type_long_slug(self):
+        t1 = DocumentType.objects.create(name="x" * 60)
+        t2 = DocumentType.objects.create(name="x" * 70)
+        self.assertEqual(t1.slug, "x" * 50)
+        self.assertEqual(len(t2.slug), 50)
+        self.assertNotEqual(t1.slug, t2.slug)
+
     def test_document_delete_protect(self):
         """Tests if the PROTECT_AFTER switch works correctly."""
         with freeze_time("2021-01-01"):
             t_old = DocumentFactory()
         self.assertRaises(ProtectedError, t_old.delete)
 
+    def test_queryset_delete_protect(self):
+        with freeze_time("2021-01-01"):
+            DocumentFactory.create_batch(2)
+        DocumentFactory()
+        with self.assertNumQueries(1):
+            self.assertRaises(ProtectedError, Document.objects.all().delete)
+        self.assertEqual(Document.objects.count(), 3)
+        Document.objects.filter(created_at__year__gt=2021).delete()
+        self.assertEqual(Document.objects.count(), 2)
+
     def test_preview_image(self):
         """Test if a preview image is set for the document."""
         d = DocumentFactory()
         self.assertIsNotNone(d.preview)
 
+    def test_preview_generated_after_commit(self):
+        """Test if the preview is rendered once the document is committed."""
+        rendered = BytesIO(b"preview")
+        with patch("dokflow.models.generate_pdf_preview", return_value=rendered):
+            with self.captureOnCommitCallbacks(execute=True):
+                d = DocumentFactory()
+                self.assertFalse(d.preview)
+        d.refresh_from_db()
+        self.assertTrue(d.preview.name.startswith("preview/"))
+        self.assertEqual(d.preview.read(), b"preview")
+
+    def test_generate_preview_reads_file_once(self):
+        d = Document.objects.get(pk=DocumentFactory().pk)
+        # Pretend the storage has no local paths, like S3
+        with patch("dokflow.utils._local_path", return_value=None), patch.object(
+            FileSystemStorage, "open", autospec=True, side_effect=FileSystemStorage.open
+        ) as open_:
+            d._generate_preview()
+        self.assertEqual(open_.call_count, 1)
+        self.assertTrue(d.file.closed)
+        self.assertTrue(Document.objects.get(pk=d.pk).preview)
+
+    def test_preview_sent_to_celery(self):
+        with patch("dokflow.tasks.PREVIEW_TASK_BACKEND", "celery"), patch(
+            "dokflow.tasks.generate_preview_task"
+        ) as task:
+            with self.captureOnCommitCallbacks(execute=True):
+                d = DocumentFactory()
+        task.delay.assert_called_once_with(d.pk)
+
+    def test_preview_broker_failure_logged(self):
+        with patch("dokflow.tasks.PREVIEW_TASK_BACKEND", "celery"), patch(
+            "dokflow.tasks.generate_preview_task"
+        ) as task:
+            task.delay.side_effect = ConnectionError("broker unreachable")
+            with self.assertLogs("dokflow.tasks", "ERROR"):
+                with self.captureOnCommitCallbacks(execute=True):
+                    DocumentFactory()
+
     def test_document_delete(self):
         """Tests if the PROTECT_AFTER switch works correctly."""
         t_new = DocumentFactory()
@@ -37,8 +106,179 @@ class DokflowTestCase(TestCase):
         d.file = get_test_document(sup=True)
         self.assertRaises(ValidationError, d.save)
 
+    def test_file_change_loaded(self):
+        d = Document.objects.get(pk=DocumentFactory().pk)
+        d.file = get_test_document(sup=True)
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertRaises(ValidationError, d.save)
+        self.assertFalse(
+            any('"dokflow_document"."file"' in q["sql"] for q in ctx.captured_queries)
+        )
+
+    def test_save_update_fields(self):
+        d = Document.objects.get(pk=DocumentFactory(content="Extracted text").pk)
+        d.name = "Renamed"
+        with CaptureQueriesContext(connection) as ctx:
+            d.save(update_fields=["name"])
+        self.assertEqual(len(ctx.captured_queries), 1)
+        self.assertNotIn('"content"', ctx.captured_queries[0]["sql"])
+        self.assertEqual(Document.objects.get(pk=d.pk).name, "Renamed")
+
+    def test_save_update_fields_unknown(self):
+        d = DocumentFactory()
+        self.assertRaises(ValueError, d.save, update_fields=["missing"])
+
+    def test_save_update_fields_positional(self):
+        d = DocumentFactory()
+        d.name = "Renamed"
+        with CaptureQueriesContext(connection) as ctx:
+            d.save(False, False, None, ["name"])
+        self.assertNotIn("content", ctx.captured_queries[-1]["sql"])
+        self.assertEqual(Document.objects.get(pk=d.pk).name, "Renamed")
+
     def test_document_replace_file(self):
         d = DocumentFactory()
         d2 = Document.objects.replace(d, get_test_document(DOCUMENT_2_PATH, sup=True))
         self.assertEqual(d2.replaces, d)
         print(d2.file.name, d.file.name)
+
+    def test_bulk_import(self):
+        rows = [
+            dict(name=f"Import {i}", type=self.t, file=get_test_document(sup=True))
+            for i in range(3)
+        ]
+        with self.captureOnCommitCallbacks() as callbacks:
+            documents = Document.objects.bulk_import(rows)
+        self.assertEqual(len(callbacks), 3)
+        self.assertEqual(Document.objects.filter(type=self.t).count(), 3)
+        for document in documents:
+            self.assertTrue(document.file.storage.exists(document.file.name))
+
+    def test_content_deferred(self):
+        d = DocumentFactory(content="Extracted text")
+        self.assertEqual(
+            Document.objects.get(pk=d.pk).get_deferred_fields(), {"content"}
+        )
+        with self.assertNumQueries(1):
+            d = Document.objects.with_content().get(pk=d.pk)
+            self.assertEqual(d.content, "Extracted text")
+
+    def test_save_keeps_content_deferred(self):
+        d = Document.objects.get(pk=DocumentFactory(content="Extracted text").pk)
+        d.name = "Renamed"
+        # Foreign key check, uuid uniqueness check and the UPDATE
+        with self.assertNumQueries(3) as ctx:
+            d.save()
+        self.assertFalse(any('"content"' in q["sql"] for q in ctx.captured_queries))
+        self.assertEqual(
+            Document.objects.with_content().get(pk=d.pk).content, "Extracted text"
+        )
+
+    def test_bulk_import_without_returned_pks(self):
+        """Tests bulk_import on backends like MySQL that return no pks."""
+        rows = [
+            dict(name=f"Import {i}", type=self.t, file=get_test_document(sup=True))
+            for i in range(3)
+        ]
+        with patch.object(
+            type(connection.features), "can_return_rows_from_bulk_insert", False
+        ):
+            with self.captureOnCommitCallbacks() as callbacks:
+                documents = Document.objects.bulk_import(rows, batch_size=2)
+        self.assertEqual(len(callbacks), 3)
+        self.assertEqual(
+            sorted(d.pk for d in documents),
+            sorted(Document.objects.filter(type=self.t).values_list("pk", flat=True)),
+        )
+
+    def test_version_chain(self):
+        d = DocumentFactory()
+        d2 = Document.objects.replace(d, get_test_document(DOCUMENT_2_PATH, sup=True))
+        d3 = Document.objects.replace(d2, get_test_document(sup=True))
+        d3 = Document.objects.get(pk=d3.pk)
+        with self.assertNumQueries(2):
+            chain = d3.version_chain
+            self.assertEqual([v.pk for v in chain], [d.pk, d2.pk, d3.pk])
+            self.assertEqual(chain[1].replaces, chain[0])
+            self.assertEqual(chain[0].type, d.type)
+            self.assertEqual([v.is_latest_version for v in chain], [False, False, True])
+
+    def test_version_chains_for(self):
+        d = DocumentFactory()
+        d2 = Document.objects.replace(d, get_test_document(DOCUMENT_2_PATH, sup=True))
+        other = DocumentFactory()
+        with self.assertNumQueries(2):
+            chains = Document.objects.version_chains_for([d2.pk, other.pk, d.pk])
+        self.assertEqual(
+            {pk: [v.pk for v in chain] for pk, chain in chains.items()},
+            {d2.pk: [d.pk, d2.pk], other.pk: [other.pk], d.pk: [d.pk]},
+        )
+        self.assertEqual(Document.objects.version_chains_for([]), {})
+
+    def test_version_chains_for_batches(self):
+        documents = DocumentFactory.create_batch(5)
+        pks = [d.pk for d in documents]
+        with patch.object(type(connection.features), "max_query_params", 2):
+            # Three batches, each with its type prefetch
+            with self.assertNumQueries(6):
+                chains = Document.objects.version_chains_for(pks)
+        self.assertEqual(
+            {pk: [v.pk for v in chain] for pk, chain in chains.items()},
+            {pk: [pk] for pk in pks},
+        )
+
+    def test_is_latest_version(self):
+        d = DocumentFactory()
+        d2 = Document.objects.replace(d, get_test_document(DOCUMENT_2_PATH, sup=True))
+        self.assertFalse(Document.objects.get(pk=d.pk).is_latest_version)
+        self.assertTrue(Document.objects.get(pk=d2.pk).is_latest_version)
+        with self.assertNumQueries(1):
+            flags = {
+                doc.pk: doc.is_latest_version
+                for doc in Document.objects.with_latest_flag()
+            }
+        self.assertEqual(flags, {d.pk: False, d2.pk: True})
+
+    def test_document_replace_skips_validation(self):
+        d = DocumentFactory()
+        with CaptureQueriesContext(connection) as ctx:
+            Document.objects.replace(d, get_test_document(DOCUMENT_2_PATH, sup=True))
+        self.assertFalse(
+            any(q["sql"].startswith("SELECT") for q in ctx.captured_queries)
+        )
+
+    def test_document_replace_loaded_document(self):
+        d = Document.objects.get(pk=DocumentFactory().pk)
+        with CaptureQueriesContext(connection) as ctx:
+            Document.objects.replace(d, get_test_document(DOCUMENT_2_PATH, sup=True))
+        selects = [
+            q["sql"] for q in ctx.captured_queries if q["sql"].startswith("SELECT")
+        ]
+        # Only the deferred content is read, not the document type
+        self.assertEqual(len(selects), 1)
+        self.assertNotIn(DocumentType._meta.db_table, selects[0])
+
+    def test_document_replace_twice_removes_file(self):
+        d = DocumentFactory()
+        Document.objects.replace(d, get_test_document(DOCUMENT_2_PATH, sup=True))
+        stored = set(default_storage.listdir(DOCUMENTS_DIR)[1])
+        self.assertRaises(
+            ValidationError,
+            Document.objects.replace,
+            d,
+            get_test_document(DOCUMENT_2_PATH, sup=True),
+        )
+        self.assertEqual(set(default_storage.listdir(DOCUMENTS_DIR)[1]), stored)
+
+    def test_document_replace_by_pk(self):
+        d = DocumentFactory()
+        d2 = Document.objects.replace(
+            d.pk, get_test_document(DOCUMENT_2_PATH, sup=True)
+        )
+        self.assertEqual(d2.replaces_id, d.pk)
+        self.assertRaises(
+            ValidationError,
+            Document.objects.replace,
+            d,
+            get_test_document(DOCUMENT_2_PATH, sup=True),
+        )
@@ -0,0 +1,33 @@
+import importlib
+from importlib.util import find_spec
+from unittest import skipUnless
+from unittest.mock import patch
+
+from django.test import SimpleTestCase
+
+import dokflow.tasks
+
+
+@skipUnless(find_spec("celery"), "Celery is not installed")
+class CeleryBackendTestCase(SimpleTestCase):
+    def setUp(self):
+        with patch("dokflow.settings.PREVIEW_TASK_BACKEND", "celery"):
+            importlib.reload(dokflow.tasks)
+        self.addCleanup(importlib.reload, dokflow.tasks)
+
+    def tearDown(self):
+        from celery.signals import worker_process_init
+
+        worker_process_init.disconnect(dispatch_uid="dokflow_warm_up_worker")
+
+    def test_task_registered(self):
+        self.assertEqual(
+            dokflow.tasks.generate_preview_task.name, "dokflow.generate_preview"
+        )
+
+    def test_worker_warm_up_connected(self):
+        from celery.signals import worker_process_init
+
+        with patch("dokflow.tasks.warm_up") as warm_up:
+            worker_process_init.send(sender=None)
+        warm_up.assert_called_once_with()
@@ -0,0 +1,86 @@
+import hashlib
+import time
+import uuid
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import TemporaryUploadedFile
+from django.test import TestCase
+from PIL import Image
+
+from dokflow.utils import (
+    PREVIEW_WIDTH,
+    _local_path,
+    generate_pdf_preview,
+    uuid7,
+    warm_up,
+)
+from tests.factories import DOCUMENT_PATH, get_test_document
+
+
+class GeneratePdfPreviewTestCase(TestCase):
+    def tearDown(self):
+        cache.clear()
+
+    def test_preview_from_bytes(self):
+        """Test if the first page of a PDF is rendered as JPEG."""
+        preview = generate_pdf_preview(get_test_document())
+        image = Image.open(preview)
+        self.assertEqual(image.format, "JPEG")
+        self.assertEqual(image.width, PREVIEW_WIDTH)
+
+    def test_preview_from_file(self):
+        with open(DOCUMENT_PATH, "rb") as infile:
+            self.assertTrue(generate_pdf_preview(infile).getvalue())
+
+    def test_preview_from_django_file(self):
+        """Test if Django files are streamed in chunks and rewound afterwards."""
+        pdf = ContentFile(get_test_document())
+        self.assertTrue(generate_pdf_preview(pdf).getvalue())
+        self.assertEqual(pdf.tell(), 0)
+
+    def test_local_path_of_temporary_upload(self):
+        upload = TemporaryUploadedFile("document.pdf", "application/pdf", 0, None)
+        self.assertEqual(_local_path(upload), upload.temporary_file_path())
+        upload.close()
+
+    def test_preview_from_path_without_spooling(self):
+        """Test if files with a local path are not copied to a spool directory."""
+        upload = TemporaryUploadedFile("document.pdf", "application/pdf", 0, None)
+        upload.write(get_test_document())
+        upload.seek(0)
+        with patch("dokflow.utils.tempfile.TemporaryDirectory") as spool_directory:
+            self.assertTrue(generate_pdf_preview(upload).getvalue())
+        spool_directory.assert_not_called()
+        upload.close()
+
+    def test_cached_preview(self):
+        """Test if a cached preview is returned without rendering the PDF."""
+        content = get_test_document()
+        digest = hashlib.sha256(content).hexdigest()
+        cache.set(f"dokflow:preview:{digest}", b"cached preview")
+        self.assertEqual(generate_pdf_preview(content).getvalue(), b"cached preview")
+
+    def test_preview_without_cache(self):
+        """Test if previews are still rendered while the cache is down."""
+        with patch.object(cache, "get", side_effect=ConnectionError), patch.object(
+            cache, "set", side_effect=ConnectionError
+        ):
+            preview = generate_pdf_preview(get_test_document())
+        self.assertTrue(preview.getvalue().startswith(b"\xff\xd8"))
+
+    def test_warm_up(self):
+        with patch("pymupdf.Page.get_pixmap", autospec=True) as get_pixmap:
+            warm_up()
+        get_pixmap.assert_called_once()
+
+
+class Uuid7TestCase(TestCase):
+    def test_uuid7(self):
+        first = uuid7()
+        time.sleep(0.002)
+        second = uuid7()
+        self.assertEqual(first.version, 7)
+        self.assertEqual(first.variant, uuid.RFC_4122)
+        self.assertLess(first, second)